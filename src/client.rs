@@ -481,7 +481,7 @@ impl From<&str> for AttributeValue {
 }
 
 /// Enum representing values assigned to a subject as a result of feature flag evaluation.
-#[derive(Debug, Serialize, Deserialize, PartialEq)]
+#[derive(Debug, Serialize, Deserialize, PartialEq, Clone)]
 pub enum AssignmentValue {
     /// A string value.
     String(String),
@@ -752,6 +752,7 @@ mod tests {
                         Variation {
                             key: "variation".to_owned(),
                             value: true.into(),
+                            assignment_value: Some(AssignmentValue::Boolean(true)),
                         },
                     )]
                     .into(),
@@ -46,6 +46,10 @@ pub enum Error {
     #[error("unauthorized, api_key is likely invalid")]
     Unauthorized,
 
+    /// Timed out waiting for the configuration to be fetched.
+    #[error("timed out waiting for configuration")]
+    ConfigurationTimeout,
+
     /// Indicates that the poller thread panicked. This should normally never happen.
     #[error("poller thread panicked")]
     PollerThreadPanicked,
@@ -63,18 +63,11 @@ impl Flag {
 
         let now = Utc::now();
 
-        // Augmenting subject_attributes with id, so that subject_key can be used in the rules.
-        let augmented_subject_attributes = {
-            let mut sa = subject_attributes.clone();
-            sa.entry("id".into()).or_insert_with(|| subject_key.into());
-            sa
-        };
-
         let Some((allocation, split)) = self.allocations.iter().find_map(|allocation| {
             allocation
                 .get_matching_split(
                     subject_key,
-                    &augmented_subject_attributes,
+                    subject_attributes,
                     sharder,
                     self.total_shards,
                     now,
@@ -93,17 +86,14 @@ impl Flag {
             Error::ConfigurationError
         })?;
 
-        let assignment_value = variation
-            .value
-            .to_assignment_value(self.variation_type)
-            .ok_or_else(|| {
-                log::warn!(target: "eppo",
-                           flag_key:display = self.key,
-                           subject_key,
-                           variation_key:display = split.variation_key;
-                           "internal: unable to convert Value to AssignmentValue");
-                Error::ConfigurationError
-            })?;
+        let assignment_value = variation.assignment_value.clone().ok_or_else(|| {
+            log::warn!(target: "eppo",
+                       flag_key:display = self.key,
+                       subject_key,
+                       variation_key:display = split.variation_key;
+                       "internal: unable to convert Value to AssignmentValue");
+            Error::ConfigurationError
+        })?;
 
         let event = if allocation.do_log {
             Some(AssignmentEvent {
@@ -135,12 +125,13 @@ impl Allocation {
     pub fn get_matching_split(
         &self,
         subject_key: &str,
-        augmented_subject_attributes: &SubjectAttributes,
+        subject_attributes: &SubjectAttributes,
         sharder: &impl Sharder,
         total_shards: u64,
         now: Timestamp,
     ) -> Option<&Split> {
-        if self.is_allowed_by_time(now) && self.is_allowed_by_rules(augmented_subject_attributes) {
+        if self.is_allowed_by_time(now) && self.is_allowed_by_rules(subject_key, subject_attributes)
+        {
             self.splits
                 .iter()
                 .find(|split| split.matches(subject_key, sharder, total_shards))
@@ -155,12 +146,16 @@ impl Allocation {
         !forbidden
     }
 
-    fn is_allowed_by_rules(&self, augmented_subject_attributes: &SubjectAttributes) -> bool {
+    fn is_allowed_by_rules(
+        &self,
+        subject_key: &str,
+        subject_attributes: &SubjectAttributes,
+    ) -> bool {
         self.rules.is_empty()
             || self
                 .rules
                 .iter()
-                .any(|rule| rule.eval(augmented_subject_attributes))
+                .any(|rule| rule.eval(subject_key, subject_attributes))
     }
 }
 
@@ -185,7 +180,7 @@ impl Shard {
 
 #[cfg(test)]
 mod tests {
-    use std::fs::{self, File};
+    use std::{fs, num::NonZeroUsize, path::Path};
 
     use serde::{Deserialize, Serialize};
 
@@ -224,45 +219,65 @@ mod tests {
         }
     }
 
-    #[test]
-    fn evaluation_sdk_test_data() {
-        let config: UniversalFlagConfig =
-            serde_json::from_reader(File::open("tests/data/ufc/flags-v1.json").unwrap()).unwrap();
-
-        for entry in fs::read_dir("tests/data/ufc/tests/").unwrap() {
-            let entry = entry.unwrap();
-            println!("Processing test file: {:?}", entry.path());
-
-            let f = File::open(entry.path()).unwrap();
-            let test_file: TestFile = serde_json::from_reader(f).unwrap();
+    fn check_test_file(config: &UniversalFlagConfig, path: &Path) {
+        let test_file: TestFile = serde_json::from_slice(&fs::read(path).unwrap()).unwrap();
+
+        let default_assignment = to_value(test_file.default_value)
+            .to_assignment_value(test_file.variation_type)
+            .unwrap();
+
+        for subject in test_file.subjects {
+            let result = config
+                .eval_flag(
+                    &test_file.flag,
+                    &subject.subject_key,
+                    &subject.subject_attributes,
+                    &Md5Sharder,
+                    Some(test_file.variation_type),
+                )
+                .unwrap_or(None);
 
-            let default_assignment = to_value(test_file.default_value)
+            let result_assingment = result
+                .as_ref()
+                .map(|(value, _event)| value)
+                .unwrap_or(&default_assignment);
+            let expected_assignment = to_value(subject.assignment)
                 .to_assignment_value(test_file.variation_type)
                 .unwrap();
 
-            for subject in test_file.subjects {
-                print!("test subject {:?} ... ", subject.subject_key);
-                let result = config
-                    .eval_flag(
-                        &test_file.flag,
-                        &subject.subject_key,
-                        &subject.subject_attributes,
-                        &Md5Sharder,
-                        Some(test_file.variation_type),
-                    )
-                    .unwrap_or(None);
-
-                let result_assingment = result
-                    .as_ref()
-                    .map(|(value, _event)| value)
-                    .unwrap_or(&default_assignment);
-                let expected_assignment = to_value(subject.assignment)
-                    .to_assignment_value(test_file.variation_type)
-                    .unwrap();
-
-                assert_eq!(result_assingment, &expected_assignment);
-                println!("ok");
-            }
+            assert_eq!(
+                result_assingment, &expected_assignment,
+                "test file {:?}, subject {:?}",
+                path, subject.subject_key
+            );
         }
     }
+
+    #[test]
+    fn evaluation_sdk_test_data() {
+        // Reading whole files and parsing from a slice is much faster than
+        // `serde_json::from_reader` over an unbuffered `File`.
+        let config: UniversalFlagConfig =
+            serde_json::from_slice(&fs::read("tests/data/ufc/flags-v1.json").unwrap()).unwrap();
+
+        let paths = fs::read_dir("tests/data/ufc/tests/")
+            .unwrap()
+            .map(|entry| entry.unwrap().path())
+            .collect::<Vec<_>>();
+
+        // Test files are independent, so check them in parallel, using at most one worker per
+        // CPU. `thread::scope` propagates panics from the spawned threads, failing the test.
+        let workers = std::thread::available_parallelism().map_or(1, NonZeroUsize::get);
+        let chunk_size = ((paths.len() + workers - 1) / workers).max(1);
+        let config = &config;
+        std::thread::scope(|scope| {
+            for chunk in paths.chunks(chunk_size) {
+                scope.spawn(move || {
+                    for path in chunk {
+                        check_test_file(config, path);
+                    }
+                });
+            }
+        });
+    }
 }
@@ -201,6 +201,50 @@ impl PollerThread {
         }
     }
 
+    /// Waits for the configuration to be fetched, giving up after `timeout`.
+    ///
+    /// This is a bounded version of [`PollerThread::wait_for_configuration`]. It blocks until
+    /// the poller thread has fetched the configuration or `timeout` elapses, whichever comes
+    /// first.
+    ///
+    /// # Errors
+    ///
+    /// This method can fail with the following errors:
+    ///
+    /// - [`Error::ConfigurationTimeout`]: If the configuration was not fetched within `timeout`.
+    /// - [`Error::Unauthorized`]: If the server rejected the API key.
+    /// - [`Error::PollerThreadPanicked`]: If the poller thread panicked while waiting for
+    /// configuration.
+    ///
+    /// # Example
+    ///
+    /// ```
+    /// # use std::time::Duration;
+    /// # fn test(mut client: eppo::Client) {
+    /// let poller = client.start_poller_thread().unwrap();
+    /// match poller.wait_for_configuration_timeout(Duration::from_secs(5)) {
+    ///     Ok(()) => println!("Configuration fetched successfully."),
+    ///     Err(err) => eprintln!("Error fetching configuration: {:?}", err),
+    /// }
+    /// # }
+    /// ```
+    pub fn wait_for_configuration_timeout(&self, timeout: Duration) -> Result<()> {
+        let lock = self
+            .result
+            .0
+            .lock()
+            .map_err(|_| Error::PollerThreadPanicked)?;
+        let (lock, _) = self
+            .result
+            .1
+            .wait_timeout_while(lock, timeout, |result| result.is_none())
+            .map_err(|_| Error::PollerThreadPanicked)?;
+        match &*lock {
+            Some(result) => result.clone(),
+            None => Err(Error::ConfigurationTimeout),
+        }
+    }
+
     /// Stop the poller thread.
     ///
     /// This function does not wait for the thread to actually stop.
@@ -246,3 +290,77 @@ impl PollerThread {
 fn jitter(interval: Duration, jitter: Duration) -> Duration {
     interval + thread_rng().gen_range(Duration::ZERO..jitter)
 }
+
+#[cfg(test)]
+mod tests {
+    use std::{
+        sync::{Arc, Condvar, Mutex},
+        time::Duration,
+    };
+
+    use crate::{Error, Result};
+
+    use super::PollerThread;
+
+    type PollerResult = Arc<(Mutex<Option<Result<()>>>, Condvar)>;
+
+    /// Create a `PollerThread` that doesn't fetch anything, returning it together with its result
+    /// slot, so that tests can simulate the fetch without network I/O.
+    fn idle_poller() -> (PollerThread, PollerResult) {
+        let result: PollerResult = Arc::new((Mutex::new(None), Condvar::new()));
+        let poller = PollerThread {
+            join_handle: std::thread::spawn(|| {}),
+            stop_sender: std::sync::mpsc::channel().0,
+            result: Arc::clone(&result),
+        };
+        (poller, result)
+    }
+
+    fn set_result(result: &PollerResult, value: Result<()>) {
+        *result.0.lock().unwrap() = Some(value);
+        result.1.notify_all();
+    }
+
+    #[test]
+    fn wait_for_configuration_timeout_expires() {
+        let (poller, _result) = idle_poller();
+
+        assert!(matches!(
+            poller.wait_for_configuration_timeout(Duration::from_millis(10)),
+            Err(Error::ConfigurationTimeout)
+        ));
+
+        poller.shutdown().unwrap();
+    }
+
+    #[test]
+    fn wait_for_configuration_timeout_returns_once_fetched() {
+        let (poller, result) = idle_poller();
+
+        let notifier = std::thread::spawn(move || {
+            std::thread::sleep(Duration::from_millis(10));
+            set_result(&result, Ok(()));
+        });
+
+        assert!(matches!(
+            poller.wait_for_configuration_timeout(Duration::from_secs(60)),
+            Ok(())
+        ));
+
+        notifier.join().unwrap();
+        poller.shutdown().unwrap();
+    }
+
+    #[test]
+    fn wait_for_configuration_timeout_returns_fetch_error() {
+        let (poller, result) = idle_poller();
+        set_result(&result, Err(Error::Unauthorized));
+
+        assert!(matches!(
+            poller.wait_for_configuration_timeout(Duration::from_secs(60)),
+            Err(Error::Unauthorized)
+        ));
+
+        poller.shutdown().unwrap();
+    }
+}
@@ -1,3 +1,5 @@
+use std::borrow::Cow;
+
 use derive_more::From;
 use regex::Regex;
 use semver::Version;
@@ -12,25 +14,93 @@ pub struct Rule {
 }
 
 impl Rule {
-    pub fn eval(&self, attributes: &SubjectAttributes) -> bool {
+    pub fn eval(&self, subject_key: &str, subject_attributes: &SubjectAttributes) -> bool {
         self.conditions
             .iter()
-            .all(|condition| condition.eval(attributes))
+            .all(|condition| condition.eval(subject_key, subject_attributes))
     }
 }
 
 #[derive(Debug, Serialize, Deserialize)]
-#[serde(rename_all = "camelCase")]
+#[serde(rename_all = "camelCase", from = "ConditionWire")]
 pub struct Condition {
     operator: Operator,
     attribute: String,
     value: ConditionValue,
+    /// `value` parsed for comparison operators once on configuration load, so it's not re-parsed
+    /// on every evaluation. `None` for other operators or if `value` is not comparable, in which
+    /// case the condition never matches.
+    #[serde(skip)]
+    comparand: Option<Comparand>,
+    /// `value` compiled for regex operators once on configuration load, so it's not recompiled
+    /// on every evaluation. `None` for other operators or if `value` is not a valid regex, in which
+    /// case the condition never matches.
+    #[serde(skip)]
+    regex: Option<Regex>,
+}
+
+/// Wire format of [`Condition`].
+#[derive(Debug, Deserialize)]
+#[serde(rename_all = "camelCase")]
+struct ConditionWire {
+    operator: Operator,
+    attribute: String,
+    value: ConditionValue,
+}
+
+impl From<ConditionWire> for Condition {
+    fn from(wire: ConditionWire) -> Self {
+        let comparand = match wire.operator {
+            Operator::Gte | Operator::Gt | Operator::Lte | Operator::Lt => {
+                Comparand::parse(&wire.value)
+            }
+            _ => None,
+        };
+        let regex = match (&wire.operator, &wire.value) {
+            (
+                Operator::Matches | Operator::NotMatches,
+                ConditionValue::Single(Value::String(s)),
+            ) => Regex::new(s).ok(),
+            _ => None,
+        };
+        Condition {
+            operator: wire.operator,
+            attribute: wire.attribute,
+            value: wire.value,
+            comparand,
+            regex,
+        }
+    }
 }
 
 impl Condition {
-    pub fn eval(&self, attributes: &SubjectAttributes) -> bool {
-        self.operator
-            .eval(attributes.get(&self.attribute), &self.value)
+    pub fn eval(&self, subject_key: &str, subject_attributes: &SubjectAttributes) -> bool {
+        // subject_key is available to the rules as "id" attribute, unless subject_attributes
+        // already define it. Resolving it here avoids cloning subject_attributes on every
+        // evaluation just to insert one key.
+        let attribute = match subject_attributes.get(&self.attribute) {
+            Some(value) => Some(Cow::Borrowed(value)),
+            None if self.attribute == "id" => Some(Cow::Owned(subject_key.into())),
+            None => None,
+        };
+        let attribute = attribute.as_deref();
+        match self.operator {
+            // Values that failed to parse or compile on load never match. Don't retry them on
+            // every evaluation.
+            Operator::Gte | Operator::Gt | Operator::Lte | Operator::Lt => self
+                .comparand
+                .as_ref()
+                .and_then(|comparand| self.operator.compare(attribute, comparand))
+                .unwrap_or(false),
+            Operator::Matches | Operator::NotMatches => self
+                .regex
+                .as_ref()
+                .and_then(|regex| self.operator.match_regex(attribute, regex))
+                .unwrap_or(false),
+            Operator::OneOf | Operator::NotOneOf | Operator::IsNull => {
+                self.operator.eval(attribute, &self.value)
+            }
+        }
     }
 }
 
@@ -52,6 +122,28 @@ impl<T: Into<Value>> From<Vec<T>> for ConditionValue {
     }
 }
 
+/// Condition value of a comparison operator.
+#[derive(Debug)]
+enum Comparand {
+    Version(Version),
+    Number(f64),
+}
+
+impl Comparand {
+    /// Parse condition value for comparison. Strings that are valid semver are compared as
+    /// versions, otherwise values are compared as numbers.
+    fn parse(condition_value: &ConditionValue) -> Option<Comparand> {
+        match condition_value {
+            ConditionValue::Single(Value::String(s)) => match Version::parse(s) {
+                Ok(version) => Some(Comparand::Version(version)),
+                Err(_) => s.parse().ok().map(Comparand::Number),
+            },
+            ConditionValue::Single(Value::Number(n)) => Some(Comparand::Number(*n)),
+            _ => None,
+        }
+    }
+}
+
 #[derive(Debug, Serialize, Deserialize, PartialEq, Eq)]
 #[serde(rename_all = "SCREAMING_SNAKE_CASE")]
 pub enum Operator {
@@ -69,6 +161,10 @@ pub enum Operator {
 impl Operator {
     /// Applying `Operator` to the values. Returns `false` if the operator cannot be applied or
     /// there's a misconfiguration.
+    ///
+    /// This parses `condition_value` on every call. [`Condition::eval`] uses values prepared on
+    /// configuration load for comparison and regex operators instead, and only calls this for
+    /// the remaining operators.
     pub fn eval(
         &self,
         attribute: Option<&AttributeValue>,
@@ -85,27 +181,21 @@ impl Operator {
     ) -> Option<bool> {
         match self {
             Self::Matches | Self::NotMatches => {
-                let s = match attribute {
-                    Some(AttributeValue::String(s)) => s,
-                    _ => return None,
-                };
                 let regex = match condition_value {
                     ConditionValue::Single(Value::String(s)) => Regex::new(s).ok()?,
                     _ => return None,
                 };
-                let matches = regex.is_match(s);
-                Some(if matches!(self, Self::Matches) {
-                    matches
-                } else {
-                    !matches
-                })
+                self.match_regex(attribute, &regex)
             }
 
             Self::OneOf | Self::NotOneOf => {
-                let s = match attribute {
-                    Some(AttributeValue::String(s)) => s.clone(),
-                    Some(AttributeValue::Number(n)) => n.to_string(),
-                    Some(AttributeValue::Boolean(b)) => b.to_string(),
+                // Borrow the attribute where possible, so that string and boolean attributes
+                // don't allocate on every evaluation.
+                let s: Cow<str> = match attribute {
+                    Some(AttributeValue::String(s)) => Cow::Borrowed(s),
+                    Some(AttributeValue::Number(n)) => Cow::Owned(n.to_string()),
+                    Some(AttributeValue::Boolean(true)) => Cow::Borrowed("true"),
+                    Some(AttributeValue::Boolean(false)) => Cow::Borrowed("false"),
                     _ => return None,
                 };
                 let values = match condition_value {
@@ -114,7 +204,7 @@ impl Operator {
                 };
                 let is_one_of = values.iter().any(|v| {
                     if let Value::String(v) = v {
-                        v == &s
+                        *v == *s
                     } else {
                         false
                     }
@@ -137,54 +227,69 @@ impl Operator {
             }
 
             Self::Gte | Self::Gt | Self::Lte | Self::Lt => {
-                let condition_version = match condition_value {
-                    ConditionValue::Single(Value::String(s)) => Version::parse(s).ok(),
+                let comparand = Comparand::parse(condition_value)?;
+                self.compare(attribute, &comparand)
+            }
+        }
+    }
+
+    /// Apply regex operator to the attribute and a compiled condition value, returning `None` if
+    /// the operator cannot be applied.
+    fn match_regex(&self, attribute: Option<&AttributeValue>, regex: &Regex) -> Option<bool> {
+        let s = match attribute {
+            Some(AttributeValue::String(s)) => s,
+            _ => return None,
+        };
+        let matches = regex.is_match(s);
+        Some(if matches!(self, Self::Matches) {
+            matches
+        } else {
+            !matches
+        })
+    }
+
+    /// Apply comparison operator to the attribute and a parsed condition value, returning `None`
+    /// if the operator cannot be applied.
+    fn compare(&self, attribute: Option<&AttributeValue>, comparand: &Comparand) -> Option<bool> {
+        match comparand {
+            Comparand::Version(condition_version) => {
+                // semver comparison
+
+                let attribute_version = match attribute {
+                    Some(AttributeValue::String(s)) => Version::parse(s).ok(),
                     _ => None,
+                }?;
+
+                Some(match self {
+                    Self::Gt => attribute_version > *condition_version,
+                    Self::Gte => attribute_version >= *condition_version,
+                    Self::Lt => attribute_version < *condition_version,
+                    Self::Lte => attribute_version <= *condition_version,
+                    _ => {
+                        // unreachable
+                        return None;
+                    }
+                })
+            }
+            Comparand::Number(condition_value) => {
+                // numeric comparison
+
+                let attribute_value = match attribute {
+                    Some(AttributeValue::Number(n)) => *n,
+                    Some(AttributeValue::String(s)) => s.parse().ok()?,
+                    _ => return None,
                 };
 
-                if let Some(condition_version) = condition_version {
-                    // semver comparison
-
-                    let attribute_version = match attribute {
-                        Some(AttributeValue::String(s)) => Version::parse(s).ok(),
-                        _ => None,
-                    }?;
-
-                    Some(match self {
-                        Self::Gt => attribute_version > condition_version,
-                        Self::Gte => attribute_version >= condition_version,
-                        Self::Lt => attribute_version < condition_version,
-                        Self::Lte => attribute_version <= condition_version,
-                        _ => {
-                            // unreachable
-                            return None;
-                        }
-                    })
-                } else {
-                    // numeric comparison
-                    let condition_value = match condition_value {
-                        ConditionValue::Single(Value::Number(n)) => *n,
-                        ConditionValue::Single(Value::String(s)) => s.parse().ok()?,
-                        _ => return None,
-                    };
-
-                    let attribute_value = match attribute {
-                        Some(AttributeValue::Number(n)) => *n,
-                        Some(AttributeValue::String(s)) => s.parse().ok()?,
-                        _ => return None,
-                    };
-
-                    Some(match self {
-                        Self::Gt => attribute_value > condition_value,
-                        Self::Gte => attribute_value >= condition_value,
-                        Self::Lt => attribute_value < condition_value,
-                        Self::Lte => attribute_value <= condition_value,
-                        _ => {
-                            // unreachable
-                            return None;
-                        }
-                    })
-                }
+                Some(match self {
+                    Self::Gt => attribute_value > *condition_value,
+                    Self::Gte => attribute_value >= *condition_value,
+                    Self::Lt => attribute_value < *condition_value,
+                    Self::Lte => attribute_value <= *condition_value,
+                    _ => {
+                        // unreachable
+                        return None;
+                    }
+                })
             }
         }
     }
@@ -195,12 +300,16 @@ mod tests {
     use std::collections::HashMap;
 
     use crate::{
-        rules::{Condition, Operator},
+        rules::{ConditionWire, Operator},
         ufc::Value,
     };
 
     use super::Rule;
 
+    // Tests calling `Operator::eval` directly cover the parse-on-call path. The `parsed_*` tests
+    // cover values prepared on configuration load, which `Condition::eval` uses for comparison
+    // and regex operators.
+
     #[test]
     fn matches_regex() {
         assert!(Operator::Matches.eval(Some(&"test@example.com".into()), &"^test.*".into()));
@@ -335,51 +444,159 @@ mod tests {
     #[test]
     fn empty_rule() {
         let rule = Rule { conditions: vec![] };
-        assert!(rule.eval(&HashMap::from([])));
+        assert!(rule.eval("subject", &HashMap::from([])));
     }
 
     #[test]
     fn single_condition_rule() {
         let rule = Rule {
-            conditions: vec![Condition {
+            conditions: vec![ConditionWire {
                 attribute: "age".into(),
                 operator: Operator::Gt,
                 value: 10.0.into(),
-            }],
+            }
+            .into()],
         };
-        assert!(rule.eval(&HashMap::from([("age".into(), 11.0.into())])));
+        assert!(rule.eval("subject", &HashMap::from([("age".into(), 11.0.into())])));
     }
 
     #[test]
     fn two_condition_rule() {
         let rule = Rule {
             conditions: vec![
-                Condition {
+                ConditionWire {
                     attribute: "age".into(),
                     operator: Operator::Gt,
                     value: 18.0.into(),
-                },
-                Condition {
+                }
+                .into(),
+                ConditionWire {
                     attribute: "age".into(),
                     operator: Operator::Lt,
                     value: 100.0.into(),
-                },
+                }
+                .into(),
             ],
         };
-        assert!(rule.eval(&HashMap::from([("age".into(), 20.0.into())])));
-        assert!(!rule.eval(&HashMap::from([("age".into(), 17.0.into())])));
-        assert!(!rule.eval(&HashMap::from([("age".into(), 110.0.into())])));
+        assert!(rule.eval("subject", &HashMap::from([("age".into(), 20.0.into())])));
+        assert!(!rule.eval("subject", &HashMap::from([("age".into(), 17.0.into())])));
+        assert!(!rule.eval("subject", &HashMap::from([("age".into(), 110.0.into())])));
+    }
+
+    #[test]
+    fn parsed_comparison_rule() {
+        let rule: Rule = serde_json::from_str(
+            r#"{
+              "conditions": [
+                { "operator": "GTE", "attribute": "appVersion", "value": "1.2.0" },
+                { "operator": "LT", "attribute": "age", "value": 100 }
+              ]
+            }"#,
+        )
+        .unwrap();
+        assert!(rule.eval(
+            "subject",
+            &HashMap::from([
+                ("appVersion".into(), "1.10.0".into()),
+                ("age".into(), 42.0.into())
+            ])
+        ));
+        assert!(!rule.eval(
+            "subject",
+            &HashMap::from([
+                ("appVersion".into(), "1.1.9".into()),
+                ("age".into(), 42.0.into())
+            ])
+        ));
+        assert!(!rule.eval(
+            "subject",
+            &HashMap::from([
+                ("appVersion".into(), "1.10.0".into()),
+                ("age".into(), 100.0.into())
+            ])
+        ));
+    }
+
+    #[test]
+    fn parsed_regex_rule() {
+        let rule: Rule = serde_json::from_str(
+            r#"{
+              "conditions": [
+                { "operator": "MATCHES", "attribute": "email", "value": "@example\\.com$" }
+              ]
+            }"#,
+        )
+        .unwrap();
+        assert!(rule.eval(
+            "subject",
+            &HashMap::from([("email".into(), "alice@example.com".into())])
+        ));
+        assert!(!rule.eval(
+            "subject",
+            &HashMap::from([("email".into(), "alice@example.org".into())])
+        ));
+        assert!(!rule.eval("subject", &HashMap::new()));
+    }
+
+    #[test]
+    fn parsed_comparison_rule_with_invalid_value() {
+        let rule: Rule = serde_json::from_str(
+            r#"{
+              "conditions": [
+                { "operator": "GT", "attribute": "age", "value": "not a number" }
+              ]
+            }"#,
+        )
+        .unwrap();
+        assert!(!rule.eval("subject", &HashMap::from([("age".into(), 42.0.into())])));
+        assert!(!rule.eval(
+            "subject",
+            &HashMap::from([("age".into(), "not a number".into())])
+        ));
+    }
+
+    #[test]
+    fn parsed_regex_rule_with_invalid_pattern() {
+        let rule: Rule = serde_json::from_str(
+            r#"{
+              "conditions": [
+                { "operator": "NOT_MATCHES", "attribute": "email", "value": "(" }
+              ]
+            }"#,
+        )
+        .unwrap();
+        assert!(!rule.eval(
+            "subject",
+            &HashMap::from([("email".into(), "alice@example.com".into())])
+        ));
+    }
+
+    #[test]
+    fn id_defaults_to_subject_key() {
+        let rule = Rule {
+            conditions: vec![ConditionWire {
+                attribute: "id".into(),
+                operator: Operator::OneOf,
+                value: vec![Value::from("alice")].into(),
+            }
+            .into()],
+        };
+        assert!(rule.eval("alice", &HashMap::new()));
+        assert!(!rule.eval("bob", &HashMap::new()));
+        // Explicit "id" attribute takes precedence over subject key.
+        assert!(rule.eval("bob", &HashMap::from([("id".into(), "alice".into())])));
     }
 
     #[test]
     fn missing_attribute() {
         let rule = Rule {
-            conditions: vec![Condition {
+            conditions: vec![ConditionWire {
                 attribute: "age".into(),
                 operator: Operator::Gt,
                 value: 10.0.into(),
-            }],
+            }
+            .into()],
         };
-        assert!(!rule.eval(&HashMap::from([("name".into(), "alice".into())])));
+        assert!(!rule.eval("subject", &HashMap::from([("name".into(), "alice".into())])));
     }
 }
@@ -48,17 +48,46 @@ impl<'a, T> From<&'a TryParse<T>> for Option<&'a T> {
 }
 
 #[derive(Debug, Serialize, Deserialize)]
-#[serde(rename_all = "camelCase")]
+#[serde(rename_all = "camelCase", from = "FlagWire")]
 pub struct Flag {
     pub key: String,
     pub enabled: bool,
     pub variation_type: VariationType,
     pub variations: HashMap<String, Variation>,
     pub allocations: Vec<Allocation>,
-    #[serde(default = "default_total_shards")]
     pub total_shards: u64,
 }
 
+/// Wire format of [`Flag`].
+#[derive(Debug, Deserialize)]
+#[serde(rename_all = "camelCase")]
+struct FlagWire {
+    key: String,
+    enabled: bool,
+    variation_type: VariationType,
+    variations: HashMap<String, Variation>,
+    allocations: Vec<Allocation>,
+    #[serde(default = "default_total_shards")]
+    total_shards: u64,
+}
+
+impl From<FlagWire> for Flag {
+    fn from(wire: FlagWire) -> Self {
+        let mut variations = wire.variations;
+        for variation in variations.values_mut() {
+            variation.assignment_value = variation.value.to_assignment_value(wire.variation_type);
+        }
+        Flag {
+            key: wire.key,
+            enabled: wire.enabled,
+            variation_type: wire.variation_type,
+            variations,
+            allocations: wire.allocations,
+            total_shards: wire.total_shards,
+        }
+    }
+}
+
 fn default_total_shards() -> u64 {
     10_000
 }
@@ -146,6 +175,11 @@ impl From<&str> for Value {
 pub struct Variation {
     pub key: String,
     pub value: Value,
+    /// `value` converted to the flag's variation type once on configuration load, so that
+    /// evaluation doesn't have to convert it (and re-parse JSON values) every time. `None` if
+    /// conversion failed.
+    #[serde(skip)]
+    pub assignment_value: Option<AssignmentValue>,
 }
 
 #[derive(Debug, Serialize, Deserialize)]
@@ -199,15 +233,43 @@ impl Range {
 
 #[cfg(test)]
 mod tests {
-    use std::{fs::File, io::BufReader};
+    use std::fs;
 
-    use super::{TryParse, UniversalFlagConfig};
+    use serde_json::json;
+
+    use crate::client::AssignmentValue;
+
+    use super::{Flag, TryParse, UniversalFlagConfig};
 
     #[test]
     fn parse_flags_v1() {
-        let f = File::open("tests/data/ufc/flags-v1.json")
-            .expect("Failed to open tests/data/ufc/flags-v1.json");
-        let _ufc: UniversalFlagConfig = serde_json::from_reader(BufReader::new(f)).unwrap();
+        let bytes = fs::read("tests/data/ufc/flags-v1.json")
+            .expect("Failed to read tests/data/ufc/flags-v1.json");
+        let _ufc: UniversalFlagConfig = serde_json::from_slice(&bytes).unwrap();
+    }
+
+    #[test]
+    fn converts_variation_values_on_load() {
+        let flag: Flag = serde_json::from_str(
+            r#"
+              {
+                "key": "json_flag",
+                "enabled": true,
+                "variationType": "JSON",
+                "variations": {
+                  "valid": { "key": "valid", "value": "{\"a\": 1}" },
+                  "invalid": { "key": "invalid", "value": "not json" }
+                },
+                "allocations": []
+              }
+            "#,
+        )
+        .unwrap();
+        assert_eq!(
+            flag.variations["valid"].assignment_value,
+            Some(AssignmentValue::Json(json!({"a": 1})))
+        );
+        assert_eq!(flag.variations["invalid"].assignment_value, None);
     }
 
     #[test]